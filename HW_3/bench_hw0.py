@@ -0,0 +1,85 @@
+"""
+Замеры классификации животных из hw0.py.
+
+Запуск: python HW_3/bench_hw0.py [количество животных]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from hw0 import (
+    Bird, Cat, Dog, Eagle, Horse, Mammal, Penguin, Reptile, Snake, Turtle,
+    group_by_family, registry,
+)
+
+SPECIES = [Dog, Cat, Horse, Eagle, Penguin, Snake, Turtle]
+
+
+class DictAnimal:
+    pass
+
+
+def classify_isinstance(animals):
+    groups = {Mammal: [], Bird: [], Reptile: []}
+    for animal in animals:
+        if isinstance(animal, Mammal):
+            groups[Mammal].append(animal)
+        elif isinstance(animal, Bird):
+            groups[Bird].append(animal)
+        elif isinstance(animal, Reptile):
+            groups[Reptile].append(animal)
+    return groups
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def allocated(factory, count):
+    tracemalloc.start()
+    objects = [factory() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def bench(count):
+    rng = random.Random(0)
+    animals = [rng.choice(SPECIES)() for _ in range(count)]
+
+    expected, chain = timed(classify_isinstance, animals)
+    groups, grouped = timed(group_by_family, animals)
+    assert all(groups.get(family, []) == members for family, members in expected.items())
+    try:
+        group_by_family([Dog(), 1])
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("group_by_family принял объект не из иерархии Animal")
+    assert registry.is_a(1, int) and registry.is_a(Dog(), object) and not registry.is_a("x", Mammal)
+
+    _, isinstance_time = timed(lambda: sum(isinstance(animal, Mammal) for animal in animals))
+    _, is_a_time = timed(lambda: sum(registry.is_a(animal, Mammal) for animal in animals))
+
+    print(f"{'операция':<28}{'млн объектов/с':>16}")
+    for name, elapsed in (
+        ("цепочка isinstance", chain),
+        ("group_by_family", grouped),
+        ("isinstance(x, Mammal)", isinstance_time),
+        ("registry.is_a(x, Mammal)", is_a_time),
+    ):
+        print(f"{name:<28}{count / elapsed / 1e6:>16.2f}")
+
+    print()
+    print(f"{'экземпляры':<28}{'байт на объект':>16}")
+    for name, factory in (("__slots__ (Dog)", Dog), ("__dict__", DictAnimal)):
+        print(f"{name:<28}{allocated(factory, count) / count:>16.1f}")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,547 @@
+"""
+Проверки и замеры пропускной способности источников данных из hw1.py.
+
+Запуск: python HW_3/bench_hw1.py [количество записей] [размер файла в МБ]
+"""
+
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import os
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import weakref
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from hw1 import (
+    AsyncNetworkResource,
+    BufferedWriter,
+    CachedSource,
+    ConnectionPool,
+    Database,
+    DiskTextFile,
+    NetworkResource,
+    ReadCache,
+    SQLiteDatabase,
+    TextFile,
+    process_data,
+    process_many,
+)
+
+
+def measure(write, count, finish=None):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(count):
+            write(f"record-{i}")
+        if finish is not None:
+            finish()
+    return time.perf_counter() - start
+
+
+def bench_buffered(count):
+    """Compare per-payload calls with BufferedWriter on sources with real bulk I/O.
+
+    TextFile, Database and NetworkResource keep only the last payload in
+    memory, so batching them saves nothing but calls; they are left out.
+    The HTTP stub is measured in bench_network.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.txt")
+        sources = [
+            ("SQLiteDatabase", lambda: SQLiteDatabase("bench.db"), "write"),
+            ("DiskTextFile", lambda: DiskTextFile(path), "append"),
+        ]
+        print(f"{'источник':<18}{'режим':<16}{'записей/с':>14}")
+        for name, make, method in sources:
+            direct = measure(getattr(make(), method), count)
+            writer = BufferedWriter(make(), batch_size=500, flush_interval=None, method=method)
+            buffered = measure(writer.write, count, writer.close)
+            print(f"{name:<18}{method:<16}{count / direct:>14.0f}")
+            print(f"{name:<18}{'buffered':<16}{count / buffered:>14.0f}")
+
+
+class FailingSource:
+    """Source without write_many that refuses the payloads in ``fail_on``."""
+
+    def __init__(self, fail_on):
+        self.fail_on = set(fail_on)
+        self.data = []
+
+    def write(self, data):
+        if data in self.fail_on:
+            raise sqlite3.OperationalError("database is locked")
+        self.data.append(data)
+
+    def read(self):
+        return self.data
+
+
+class PartialSource(FailingSource):
+    """FailingSource with write_many that stops at the first refused payload."""
+
+    def write_many(self, items):
+        for written, item in enumerate(items):
+            try:
+                self.write(item)
+            except sqlite3.OperationalError as error:
+                error.written = written
+                raise
+
+
+def check_buffered():
+    with tempfile.TemporaryDirectory() as directory:
+        sources = [
+            lambda: TextFile("check.txt"),
+            lambda: Database("check.db"),
+            lambda: SQLiteDatabase("check.db"),
+            lambda: NetworkResource("http://localhost/api"),
+            lambda: DiskTextFile(os.path.join(directory, "check.txt")),
+        ]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for make in sources:
+                direct = make()
+                for data in "abc":
+                    direct.write(data)
+                with BufferedWriter(make(), batch_size=2) as writer:
+                    for data in "abc":
+                        writer.write(data)
+                assert writer.read() == direct.read(), type(direct).__name__
+                generated = make()
+                generated.write_many(data for data in "abc")
+                assert generated.read() == direct.read(), type(direct).__name__
+        source = DiskTextFile(os.path.join(directory, "append.txt"))
+        with BufferedWriter(source, batch_size=2, method="append") as writer:
+            for data in "abc":
+                writer.write(f"{data}\n")
+        assert list(source.iter_lines()) == ["a\n", "b\n", "c\n"]
+    print("✓ Тест одинаковой семантики write и write_many пройден")
+
+    database = SQLiteDatabase("check.db")
+    writer = BufferedWriter(database, batch_size=10)
+    writer.write("a")
+    writer.write("b")
+    database.connection.execute("DROP TABLE records")
+    expect_error(sqlite3.OperationalError, writer.flush)
+    assert writer.buffer == ["a", "b"], "Пакет потерян после ошибки write_many"
+    database.connection.execute("CREATE TABLE records (payload TEXT)")
+    with contextlib.redirect_stdout(io.StringIO()):
+        writer.flush()
+    assert writer.buffer == [] and database.count() == 2
+
+    source = FailingSource(fail_on={"b"})
+    writer = BufferedWriter(source, batch_size=10)
+    for data in "abc":
+        writer.write(data)
+    expect_error(sqlite3.OperationalError, writer.flush)
+    assert source.data == ["a"] and writer.buffer == ["b", "c"], "Неверный остаток буфера после ошибки"
+    source.fail_on.clear()
+    assert writer.read() == ["a", "b", "c"]
+
+    source = PartialSource(fail_on={"c"})
+    writer = BufferedWriter(source, batch_size=10)
+    for data in "abcd":
+        writer.write(data)
+    expect_error(sqlite3.OperationalError, writer.flush)
+    assert writer.buffer == ["c", "d"], "Принятые write_many записи остались в буфере"
+    source.fail_on.clear()
+    assert writer.read() == ["a", "b", "c", "d"]
+    print("✓ Тест сохранения буфера при ошибке пройден")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Local HTTP stub; the first path segment selects the behaviour.
+
+    ``/slow`` answers after ``server.slow_latency`` seconds, ``/flaky``
+    answers 503 to the first request on a path, ``/error`` always answers
+    500, ``/missing`` answers 404, everything else echoes the body.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.01
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        self._answer(b"ok")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self._answer(self.rfile.read(length))
+
+    def _answer(self, body):
+        with self.server.lock:
+            hits = self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        kind = self.path.split("/")[1]
+        status = 200
+        if kind == "slow":
+            time.sleep(self.server.slow_latency)
+        elif kind == "flaky" and hits == 1 or kind == "error":
+            status, body = 503 if kind == "flaky" else 500, b"fail"
+        elif kind == "missing":
+            status, body = 404, b"missing"
+        time.sleep(self.latency)
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    slow_latency = 0.5
+
+    def __init__(self, address, handler):
+        super().__init__(address, handler)
+        self.lock = threading.Lock()
+        self.hits = {}
+        self.connections = 0
+
+    def handle_error(self, request, client_address):
+        # Клиент закрывает соединение после таймаута, это ожидаемо.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@contextlib.contextmanager
+def stub_server():
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def expect_error(error_type, function, *args):
+    try:
+        function(*args)
+    except error_type:
+        return
+    raise AssertionError(f"Ожидалось исключение {error_type.__name__}")
+
+
+def check_network():
+    with stub_server() as server:
+        url = server.url
+
+        async def reuse():
+            async with ConnectionPool() as pool:
+                resource = AsyncNetworkResource(f"{url}/api/reuse", pool=pool)
+                for i in range(5):
+                    assert await resource.awrite(f"record-{i}") == f"record-{i}"
+                    await resource.aread()
+                return pool.opened
+
+        assert asyncio.run(reuse()) == 1, "Соединение из пула не переиспользуется"
+        assert server.connections == 1, f"Открыто соединений: {server.connections}"
+        print("✓ Тест переиспользования соединений пройден")
+
+        resource = AsyncNetworkResource(f"{url}/api/loops")
+        asyncio.run(resource.awrite("x"))
+        assert asyncio.run(resource.aread()) == f"Ответ с {url}/api/loops: ok"
+        assert resource.pool is None
+        print("✓ Тест вызовов из разных циклов событий пройден")
+
+        assert AsyncNetworkResource(f"{url}/flaky/get").read().endswith(": ok")
+        assert server.hits["/flaky/get"] == 2
+        expect_error(ConnectionError, asyncio.run, AsyncNetworkResource(f"{url}/flaky/post").awrite("x"))
+        assert server.hits["/flaky/post"] == 1, "POST после ответа 5xx отправлен повторно"
+        expect_error(ConnectionError, AsyncNetworkResource(f"{url}/error/get", retries=2).read)
+        assert server.hits["/error/get"] == 3
+        print("✓ Тест повторов при ответах 5xx пройден")
+
+        expect_error(ValueError, AsyncNetworkResource(f"{url}/missing/get").read)
+        assert server.hits["/missing/get"] == 1, "Ответ 4xx не должен повторяться"
+        print("✓ Тест ответов 4xx пройден")
+
+        slow = AsyncNetworkResource(f"{url}/slow/get", timeout=0.1, retries=1)
+        expect_error(asyncio.TimeoutError, slow.read)
+        slow = AsyncNetworkResource(f"{url}/slow/post", timeout=0.1, retries=1)
+        expect_error(asyncio.TimeoutError, asyncio.run, slow.awrite("x"))
+        time.sleep(server.slow_latency)
+        assert server.hits["/slow/get"] == 2, "GET после таймаута не повторен"
+        assert server.hits["/slow/post"] == 1, "POST после таймаута отправлен повторно"
+        print("✓ Тест таймаутов пройден")
+
+        expect_error(OSError, AsyncNetworkResource("http://127.0.0.1:1/api", retries=1, timeout=1).read)
+        print("✓ Тест недоступного сервера пройден")
+
+        own_pool = ConnectionPool()
+        resource = AsyncNetworkResource(f"{url}/api/twice", pool=own_pool)
+        results = process_many([resource, resource], "y")
+        assert results == [f"Ответ с {url}/api/twice: ok"] * 2
+        assert resource.pool is own_pool, "process_many не вернул источнику его пул"
+        print("✓ Тест process_many с повторяющимся источником пройден")
+
+        database = SQLiteDatabase("check.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = process_many([database, database, Database("plain.db")], "a")
+        assert results[0] == "Данные из базы check.db: a" and database.count() == 2
+        print("✓ Тест process_many с SQLiteDatabase пройден")
+
+        connections = server.connections
+        resource = AsyncNetworkResource(f"{url}/api/pipeline")
+        with contextlib.redirect_stdout(io.StringIO()):
+            with BufferedWriter(resource, batch_size=10) as writer:
+                for i in range(25):
+                    writer.write(f"record-{i}")
+        assert server.hits["/api/pipeline"] == 25
+        assert server.connections - connections == 3, "Пакет отправлен не по одному соединению"
+        assert resource.request_data == "record-24" and resource.response == "record-24"
+        print("✓ Тест конвейерной отправки write_many пройден")
+
+        for path, error_type in (("/flaky/pipeline", ConnectionError), ("/missing/pipeline", ValueError)):
+            writer = BufferedWriter(AsyncNetworkResource(f"{url}{path}"), batch_size=10)
+            for i in range(3):
+                writer.write(f"r{i}")
+            expect_error(error_type, writer.flush)
+            assert writer.buffer == [], f"{path}: отвеченные записи остались в буфере"
+            writer.flush()
+            assert server.hits[path] == 3, f"{path}: записи отправлены повторно"
+        print("✓ Тест ошибок в середине пакета пройден")
+
+
+def bench_network(count):
+    with stub_server() as server:
+        sources = [AsyncNetworkResource(f"{server.url}/api/{i}") for i in range(count)]
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            serial = [process_data(source, "POST data") for source in sources]
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fanout = process_many(sources, "POST data", concurrency=32)
+        fanout_time = time.perf_counter() - start
+
+        # Без искусственной задержки сервера видна стоимость соединений.
+        StubHandler.latency, latency = 0, StubHandler.latency
+        try:
+            resource = AsyncNetworkResource(f"{server.url}/api/batch")
+            direct = measure(resource.write, count)
+            writer = BufferedWriter(resource, batch_size=100, flush_interval=None)
+            buffered = measure(writer.write, count, writer.close)
+        finally:
+            StubHandler.latency = latency
+
+    assert serial == fanout, "Результаты process_many расходятся с последовательным циклом"
+    print(f"{'режим':<16}{'запросов/с':>12}{'мс на запрос':>18}")
+    for name, elapsed in (
+        ("serial", serial_time),
+        ("process_many", fanout_time),
+        ("write", direct),
+        ("buffered", buffered),
+    ):
+        print(f"{name:<16}{count / elapsed:>12.0f}{elapsed / count * 1000:>18.2f}")
+
+
+class SlowDatabase(Database):
+    latency = 0.001
+
+    def __init__(self, dbname):
+        super().__init__(dbname)
+        self.reads = 0
+
+    def read(self):
+        self.reads += 1
+        time.sleep(self.latency)
+        return super().read()
+
+
+class SlowSource:
+    def __init__(self):
+        self.data = None
+
+    def write(self, data):
+        self.data = data
+
+    def read(self):
+        data = self.data
+        time.sleep(0.2)
+        return data
+
+
+def check_cache():
+    cache = ReadCache(maxsize=2)
+    sources = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(1000):
+            source = CachedSource(Database(f"check{i}.db"), cache)
+            source.read()
+            source.write(i)
+            sources.append(weakref.ref(source))
+    del source
+    gc.collect()
+    assert not cache.entries and not cache._inflight
+    assert all(ref() is None for ref in sources), "Кэш удерживает источники после записи"
+    print("✓ Тест освобождения источников кэшем пройден")
+
+    source = CachedSource(SlowSource())
+    source.write("old")
+    reader = threading.Thread(target=source.read)
+    reader.start()
+    time.sleep(0.05)
+    source.write("new")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        late = executor.submit(source.read).result()
+    reader.join()
+    assert late == "new", "Чтение после записи получило старое значение"
+    assert source.read() == "new", "Кэш сохранил значение, прочитанное до записи"
+    print("✓ Тест инвалидации во время чтения пройден")
+
+
+def bench_cache(count, write_every=50):
+    print(f"{'режим':<16}{'мкс на read':>14}{'обращений к базе':>20}")
+    for name, wrap in (("без кэша", lambda db: db), ("CachedSource", CachedSource)):
+        database = SlowDatabase("bench.db")
+        source = wrap(database)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(count):
+                process_data(source, f"record-{i}" if i % write_every == 0 else None)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<16}{elapsed / count * 1e6:>14.1f}{database.reads:>20}")
+
+    database = SlowDatabase("bench.db")
+    database.latency = 0.05
+    source = CachedSource(database)
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda _: source.read(), range(64)))
+    print(f"64 параллельных read: обращений к базе {database.reads}, {source.stats()}")
+
+
+def make_text_file(path, size_mb):
+    line = "".join(chr(ord("a") + i % 26) for i in range(79)) + "\n"
+    block = line * ((1 << 20) // len(line))
+    with open(path, "w", encoding="utf-8") as file:
+        written = 0
+        while written < size_mb << 20:
+            file.write(block)
+            written += len(block)
+
+
+def check_text_file():
+    with tempfile.TemporaryDirectory() as directory:
+        source = DiskTextFile(os.path.join(directory, "check.txt"))
+        source.append_many(["hello ", "world\n"])
+        with source.view() as data:
+            head = data[:5]
+        assert bytes(head) == b"hello", "Срез недоступен после выхода из view()"
+        head.release()
+        assert list(source.iter_lines()) == ["hello world\n"]
+    print("✓ Тест срезов view() пройден")
+
+
+def read_whole(source):
+    return len(source.read())
+
+
+def read_lines(source):
+    return sum(len(line) for line in source.iter_lines())
+
+
+def read_blocks(source):
+    crc = 0
+    for block in source.iter_blocks():
+        crc = zlib.crc32(block, crc)
+    return crc
+
+
+def read_mapped(source):
+    with source.view() as data:
+        return zlib.crc32(data)
+
+
+TEXT_WORKLOADS = {
+    "idle": lambda source: None,
+    "read": read_whole,
+    "iter_lines": read_lines,
+    "iter_blocks": read_blocks,
+    "view": read_mapped,
+}
+
+
+def run_text_workload(name, filename):
+    """Run one workload in this process and print its measurements as JSON.
+
+    RSS is the process peak (``ru_maxrss``) after the timed run, so it
+    includes mapped and page-cache pages touched by the workload; the Python
+    heap peak comes from a second run under tracemalloc.
+    """
+    source = DiskTextFile(filename)
+    workload = TEXT_WORKLOADS[name]
+    start = time.perf_counter()
+    workload(source)
+    elapsed = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss *= 1 if sys.platform == "darwin" else 1024
+    tracemalloc.start()
+    workload(source)
+    heap = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(json.dumps({"elapsed": elapsed, "rss": rss, "heap": heap}))
+
+
+def bench_text_file(size_mb):
+    with tempfile.TemporaryDirectory() as directory:
+        source = DiskTextFile(os.path.join(directory, "bench.txt"))
+        make_text_file(source.filename, size_mb)
+
+        names = ["idle", "iter_lines", "iter_blocks", "view"]
+        if size_mb <= 512:
+            names.insert(1, "read")
+
+        size = source.size() / (1 << 20)
+        print(f"файл {size:.0f} МБ; каждый режим запускается в отдельном процессе")
+        print(f"{'режим':<14}{'МБ/с':>10}{'пик RSS, МБ':>14}{'пик кучи Python, МБ':>22}")
+        for name in names:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--text-workload", name, source.filename],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output)
+            speed = f"{size / result['elapsed']:.0f}" if name != "idle" else "-"
+            print(f"{name:<14}{speed:>10}{result['rss'] / (1 << 20):>14.1f}{result['heap'] / (1 << 20):>22.1f}")
+
+
+if __name__ == "__main__" and sys.argv[1:2] == ["--text-workload"]:
+    run_text_workload(sys.argv[2], sys.argv[3])
+elif __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    check_buffered()
+    check_network()
+    check_cache()
+    check_text_file()
+    print()
+    bench_buffered(count)
+    print()
+    bench_network(max(1, count // 100))
+    print()
+    bench_cache(max(1, count // 10))
+    print()
+    bench_text_file(int(sys.argv[2]) if len(sys.argv) > 2 else 64)
@@ -152,20 +152,21 @@ def game_loop(player, enemies, items, turns=5):
     print(f"Final score: {player.score}")
     print(f"Player health: {player.health}")
 
-player = Player(0, 0, "Герой", health=100)
+if __name__ == "__main__":
+    player = Player(0, 0, "Герой", health=100)
 
-enemies = [
-    Enemy(1, 0, "Скелет", health=30, damage=5),
-    Enemy(0, 1, "Гоблин", health=20, damage=3),
-    Boss(1, 1, "Дракон", health=150, damage=20)
-]
+    enemies = [
+        Enemy(1, 0, "Скелет", health=30, damage=5),
+        Enemy(0, 1, "Гоблин", health=20, damage=3),
+        Boss(1, 1, "Дракон", health=150, damage=20)
+    ]
 
-items = [
-    Item(0, 0, "Монета", value=10),
-    Item(2, 2, "Зелье", value=20),
-]
+    items = [
+        Item(0, 0, "Монета", value=10),
+        Item(2, 2, "Зелье", value=20),
+    ]
 
-game_loop(player, enemies, items, turns=5)
+    game_loop(player, enemies, items, turns=5)
 
 """
 Character(GameObject, Movable), потому что GameObject содержит логику и данные (x, y, name), а Movable — только интерфейс (без данных).
@@ -15,34 +15,118 @@ Animal (базовый класс)
 """
 
 class Animal:
-    pass
+    __slots__ = ()
 
 class Mammal(Animal):
-    pass
+    __slots__ = ()
 
 class Dog(Mammal):
-    pass
+    __slots__ = ()
 
 class Cat(Mammal):
-    pass
+    __slots__ = ()
 
 class Horse(Mammal):
-    pass
+    __slots__ = ()
 
 class Bird(Animal):
-    pass
+    __slots__ = ()
 
 class Eagle(Bird):
-    pass
+    __slots__ = ()
 
 class Penguin(Bird):
-    pass
+    __slots__ = ()
 
 class Reptile(Animal):
-    pass
+    __slots__ = ()
 
 class Snake(Reptile):
-    pass
+    __slots__ = ()
 
 class Turtle(Reptile):
-    pass
+    __slots__ = ()
+
+
+class TypeRegistry:
+    """Precomputed type ids and ancestor bitmasks for a class hierarchy.
+
+    Every class gets a small integer id; its mask has the bits of the class
+    itself and of all its registered ancestors set.  The family of a class
+    (the direct subclass of the root it descends from) is the family whose
+    bit is set in its mask; ``group_by_family`` looks it up once per type.
+    ``is_a`` answers from the mask too, but for a single check in CPython
+    the builtin ``isinstance`` is faster and should be preferred.
+    Subclasses defined later are registered on first use.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.ids = {}
+        self.masks = {}
+        self.families = {}
+        self.family_classes = []
+        pending = [root]
+        while pending:
+            cls = pending.pop(0)
+            self.register(cls)
+            pending.extend(cls.__subclasses__())
+
+    def register(self, cls):
+        if cls in self.masks:
+            return self.masks[cls]
+        if not issubclass(cls, self.root):
+            raise TypeError(f"{cls.__name__} не наследуется от {self.root.__name__}")
+        mask = 0
+        for base in cls.__bases__:
+            if issubclass(base, self.root):
+                mask |= self.register(base)
+        self.ids[cls] = len(self.ids)
+        self.masks[cls] = mask | (1 << self.ids[cls])
+        if self.root in cls.__bases__:
+            self.family_classes.append(cls)
+        return self.masks[cls]
+
+    def type_id(self, cls):
+        self.register(cls)
+        return self.ids[cls]
+
+    def is_a(self, obj, cls):
+        mask = self.masks.get(type(obj))
+        if mask is None:
+            if not isinstance(obj, self.root):
+                return isinstance(obj, cls)
+            mask = self.register(type(obj))
+        bit = self.ids.get(cls)
+        if bit is None:
+            return isinstance(obj, cls)
+        return mask >> bit & 1 == 1
+
+    def family(self, cls):
+        """Return the direct subclass of the root ``cls`` descends from."""
+        family = self.families.get(cls)
+        if family is None:
+            mask = self.register(cls)
+            family = self.root
+            for candidate in self.family_classes:
+                if mask >> self.ids[candidate] & 1:
+                    family = candidate
+                    break
+            self.families[cls] = family
+        return family
+
+    def group_by_family(self, objects):
+        groups = {}
+        families = self.families
+        for obj in objects:
+            cls = type(obj)
+            family = families.get(cls) or self.family(cls)
+            group = groups.get(family)
+            if group is None:
+                group = groups[family] = []
+            group.append(obj)
+        return groups
+
+
+registry = TypeRegistry(Animal)
+group_by_family = registry.group_by_family
@@ -0,0 +1,317 @@
+"""
+Общий набор замеров для всех заданий.
+
+Каждый замер строит синтетические данные нужного размера, прогоняет горячий
+путь модуля несколько раз и записывает пропускную способность, задержку и
+пиковую память. Результаты можно сохранить в JSON и сравнить с сохраненным
+базовым прогоном.
+
+Примеры:
+    python bench.py --scale 10 --output results.json
+    python bench.py --baseline results.json --threshold 0.3
+    python bench.py --only network --profile --trace-memory
+"""
+
+import argparse
+import contextlib
+import cProfile
+import importlib.util
+import io
+import json
+import os
+import platform
+import pstats
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_module(name, relative_path):
+    path = os.path.join(ROOT, relative_path)
+    directory = os.path.dirname(path)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+task = load_module("task", "GitHub_task/task.py")
+lab_easy = load_module("lab_easy", "HW_2/lab_easy.py")
+lab_adv = load_module("lab_adv", "HW_2/lab_adv.py")
+hw = load_module("hw", "HW_3/hw.py")
+hw1 = load_module("hw1", "HW_3/hw1.py")
+
+
+# Генераторы синтетических данных
+
+def make_network(computers, rng):
+    network = task.Network("bench network")
+    for i in range(computers):
+        computer = (
+            task.Computer(f"host{i}.bench")
+            .add_address(f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}")
+            .add_component(task.CPU(rng.choice([2, 4, 8, 16]), rng.randrange(1800, 4000, 100)))
+            .add_component(task.Memory(rng.choice([4096, 8192, 16384])))
+        )
+        disk = task.Disk(rng.choice([task.Disk.SSD, task.Disk.MAGNETIC]), 1000)
+        for p in range(rng.randint(1, 3)):
+            disk.add_partition(100 * (p + 1), f"part{p}")
+        network.add_computer(computer.add_component(disk))
+    return network
+
+
+def make_books(count, rng):
+    authors = [f"Автор {i}" for i in range(max(1, count // 20))]
+    genres = ["Роман", "Поэзия", "Драма", "Фантастика", "Детектив"]
+    return [
+        (f"Книга {i}", rng.choice(authors), rng.randint(1800, 2024), rng.choice(genres))
+        for i in range(count)
+    ]
+
+
+def make_enrollment(students, rng):
+    """Return course and student specs; build_enrollment turns them into objects."""
+    skills = [f"Навык {i}" for i in range(10)]
+    courses = [
+        (f"Курс {i}", max(1, students // 5), rng.sample(skills, 2))
+        for i in range(max(1, students // 50))
+    ]
+    people = [(f"Студент {i}", i, rng.sample(skills, 5)) for i in range(students)]
+    return courses, people
+
+
+def build_enrollment(courses, people):
+    built_courses = [
+        lab_adv.Course(name, capacity=capacity, requirements=list(requirements))
+        for name, capacity, requirements in courses
+    ]
+    students = []
+    for name, student_id, skills in people:
+        student = lab_adv.Student(name, student_id)
+        for skill in skills:
+            student.add_skill(skill)
+        students.append(student)
+    return built_courses, students
+
+
+def make_game(enemies, rng):
+    """Return enemy and item specs; build_game turns them into objects."""
+    foes = [(rng.randint(-5, 5), rng.randint(-5, 5)) for _ in range(enemies)]
+    items = [(rng.randint(-3, 3), rng.randint(-3, 3)) for _ in range(enemies // 2)]
+    return foes, items
+
+
+def build_game(foes, items):
+    player = hw.Player(0, 0, "Герой", health=10 ** 9)
+    enemies = []
+    for i, (x, y) in enumerate(foes):
+        if i % 10 == 0:
+            enemies.append(hw.Boss(x, y, f"Босс {i}", health=150, damage=20))
+        else:
+            enemies.append(hw.Enemy(x, y, f"Враг {i}", health=30, damage=1))
+    loot = [hw.Item(x, y, f"Предмет {i}", value=10) for i, (x, y) in enumerate(items)]
+    return player, enemies, loot
+
+
+def make_payloads(count, rng):
+    return [{"id": i, "value": rng.random()} for i in range(count)]
+
+
+# Замеры. Каждый возвращает (run, количество операций, setup). Если setup
+# не None, он вызывается перед каждым прогоном вне замера времени, и его
+# результат передается в run как аргументы.
+
+def bench_network(scale, rng):
+    network = make_network(200 * scale, rng)
+    names = [f"host{rng.randrange(200 * scale)}.bench" for _ in range(100)]
+
+    def run():
+        copy = network.clone()
+        for name in names:
+            copy.find_computer(name)
+        str(copy)
+
+    return run, 200 * scale, None
+
+
+def bench_library(scale, rng):
+    books = make_books(1000 * scale, rng)
+
+    def run():
+        library = lab_easy.PersonalLibrary()
+        for book in books:
+            library.add_book(*book)
+        for book_id in range(1, len(books) + 1, 2):
+            library.lend_book(book_id, "Читатель")
+            library.return_book(book_id)
+        for genre in ("Роман", "Драма"):
+            library.find_books(genre=genre)
+
+    return run, 1000 * scale, None
+
+
+def bench_enrollment(scale, rng):
+    specs = make_enrollment(500 * scale, rng)
+
+    def setup():
+        return build_enrollment(*specs)
+
+    def run(courses, students):
+        grading = lab_adv.GradingSystem()
+        for student in students:
+            for course in courses:
+                if course.enroll_student(student):
+                    grading.add_grade(student, course, "Экзамен", 4.0)
+                    grading.calculate_final_grades(student, course)
+
+    return run, 500 * scale, setup
+
+
+def bench_game(scale, rng):
+    specs = make_game(50 * scale, rng)
+
+    def setup():
+        random.seed(0)
+        return build_game(*specs)
+
+    def run(player, enemies, items):
+        hw.game_loop(player, enemies, items, turns=10)
+
+    return run, 50 * scale * 10, setup
+
+
+def bench_data_sources(scale, rng):
+    payloads = make_payloads(1000 * scale, rng)
+
+    def run():
+        sources = [
+            hw1.TextFile("bench.txt"),
+            hw1.Database("bench.db"),
+            hw1.NetworkResource("http://localhost/api"),
+        ]
+        for payload in payloads:
+            for source in sources:
+                hw1.process_data(source, payload)
+
+    return run, 1000 * scale * 3, None
+
+
+BENCHMARKS = {
+    "network": bench_network,
+    "library": bench_library,
+    "enrollment": bench_enrollment,
+    "game": bench_game,
+    "data_sources": bench_data_sources,
+}
+
+
+def measure(name, scale, repeat, profile=False, trace_memory=False):
+    run, operations, setup = BENCHMARKS[name](scale, random.Random(0))
+    prepare = setup or tuple
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            args = prepare()
+            start = time.perf_counter()
+            run(*args)
+            timings.append(time.perf_counter() - start)
+
+        args = prepare()
+        tracemalloc.start()
+        run(*args)
+        snapshot = tracemalloc.take_snapshot() if trace_memory else None
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        profiler = None
+        if profile:
+            args = prepare()
+            profiler = cProfile.Profile()
+            profiler.runcall(run, *args)
+
+    best = min(timings)
+    result = {
+        "operations": operations,
+        "best_s": best,
+        "median_s": statistics.median(timings),
+        "throughput_ops": operations / best,
+        "latency_us": best / operations * 1e6,
+        "peak_memory_bytes": peak,
+    }
+    if profiler is not None:
+        print(f"\n--- cProfile: {name} ---")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+    if snapshot is not None:
+        print(f"\n--- tracemalloc: {name} ---")
+        for stat in snapshot.statistics("lineno")[:10]:
+            print(stat)
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Return the benchmarks whose throughput dropped by more than ``threshold``."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        ratio = result["throughput_ops"] / previous["throughput_ops"]
+        if ratio < 1 - threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры горячих путей всех заданий.")
+    parser.add_argument("--scale", type=int, default=1, help="множитель размера синтетических данных")
+    parser.add_argument("--repeat", type=int, default=5, help="число повторов каждого замера")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="запустить только эти замеры")
+    parser.add_argument("--output", help="сохранить результаты в JSON")
+    parser.add_argument("--baseline", help="JSON предыдущего прогона для поиска регрессий")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустимое падение пропускной способности")
+    parser.add_argument("--profile", action="store_true", help="вывести профиль cProfile")
+    parser.add_argument("--trace-memory", action="store_true", help="вывести крупнейшие аллокации tracemalloc")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'замер':<14}{'оп/с':>14}{'мкс/оп':>10}{'пик памяти, КБ':>18}")
+    for name in args.only or BENCHMARKS:
+        result = measure(name, args.scale, args.repeat, args.profile, args.trace_memory)
+        results[name] = result
+        print(
+            f"{name:<14}{result['throughput_ops']:>14.0f}{result['latency_us']:>10.2f}"
+            f"{result['peak_memory_bytes'] / 1024:>18.1f}"
+        )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline.get("scale") != args.scale:
+            print(f"Внимание: базовый прогон сделан с scale={baseline.get('scale')}")
+        regressions = compare(results, baseline, args.threshold)
+        for name, ratio in regressions:
+            print(f"Регрессия: {name} — {ratio:.0%} от базовой пропускной способности")
+        if regressions:
+            return 1
+        print("Регрессий нет.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())